@@ -5,45 +5,67 @@ All physical actions the robot can perform.
 This module owns the Picarx instance. Other modules import px from here.
 """
 
-import time
+import functools
+import threading
+from collections.abc import Callable
 from picarx import Picarx
 
 # Single shared instance - other modules import this
 px = Picarx()
 
+# Set by cancel_actions() - every pause in a routine waits on this instead of
+# sleeping, so a wake word can abort dance() mid-sequence within one step.
+_cancel = threading.Event()
+
+def _pause(seconds: float) -> bool:
+    """Wait between steps. Returns True if the routine was cancelled."""
+    return _cancel.wait(seconds)
+
+def cancel_actions():
+    """Abort the running action sequence (e.g. on wake word)."""
+    _cancel.set()
+
+def steer(angle: int):
+    """Set steering angle, skipping the servo write if it's already there."""
+    # Picarx tracks the last commanded angle; most routines re-center an
+    # already centered wheel, and each write is an I2C transaction.
+    if getattr(px, "dir_current_angle", None) == angle:
+        return
+    px.set_dir_servo_angle(angle)
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MOVEMENT ACTIONS (blocked in table_mode)
 # ═══════════════════════════════════════════════════════════════════════════════
 
 def move_forward():
     """Drive forward - shows interest, approaching"""
-    px.set_dir_servo_angle(0)
+    steer(0)
     px.forward(30)
-    time.sleep(1.5)
+    _pause(1.5)
     px.stop()
 
 def move_backward():
     """Drive backward - surprised, skeptical, retreating"""
-    px.set_dir_servo_angle(0)
+    steer(0)
     px.backward(30)
-    time.sleep(1.5)
+    _pause(1.5)
     px.stop()
 
 def turn_left():
     """Turn left"""
-    px.set_dir_servo_angle(-30)
+    steer(-30)
     px.forward(30)
-    time.sleep(1.0)
+    _pause(1.0)
     px.stop()
-    px.set_dir_servo_angle(0)
+    steer(0)
 
 def turn_right():
     """Turn right"""
-    px.set_dir_servo_angle(30)
+    steer(30)
     px.forward(30)
-    time.sleep(1.0)
+    _pause(1.0)
     px.stop()
-    px.set_dir_servo_angle(0)
+    steer(0)
 
 def stop():
     """Stop all movement"""
@@ -53,25 +75,30 @@ def rock_back_forth():
     """Rock back and forth - laughing, amused"""
     for _ in range(4):
         px.forward(40)
-        time.sleep(0.15)
+        if _pause(0.15):
+            break
         px.backward(40)
-        time.sleep(0.15)
+        if _pause(0.15):
+            break
     px.stop()
 
 def dance():
     """Dance - celebration, joy (rare)"""
     # Wiggle steering while rocking
     for i in range(3):
-        px.set_dir_servo_angle(-20)
+        steer(-20)
         px.forward(30)
-        time.sleep(0.3)
-        px.set_dir_servo_angle(20)
+        if _pause(0.3):
+            break
+        steer(20)
         px.backward(30)
-        time.sleep(0.3)
-    px.set_dir_servo_angle(0)
+        if _pause(0.3):
+            break
+    steer(0)
     px.stop()
     # Add head movement
-    look_around()
+    if not _cancel.is_set():
+        look_around()
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # HEAD ACTIONS (always allowed)
@@ -95,12 +122,10 @@ def look_right():
 
 def look_around():
     """Pan around - curious, exploring"""
-    px.set_cam_pan_angle(-60)
-    time.sleep(0.5)
-    px.set_cam_pan_angle(0)
-    time.sleep(0.5)
-    px.set_cam_pan_angle(60)
-    time.sleep(0.5)
+    for angle in (-60, 0, 60):
+        px.set_cam_pan_angle(angle)
+        if _pause(0.5):
+            break
     px.set_cam_pan_angle(0)
 
 def look_at_person():
@@ -112,18 +137,22 @@ def nod():
     """Nod - yes, agree, understand"""
     for _ in range(3):
         px.set_cam_tilt_angle(-15)
-        time.sleep(0.15)
+        if _pause(0.15):
+            break
         px.set_cam_tilt_angle(10)
-        time.sleep(0.15)
+        if _pause(0.15):
+            break
     px.set_cam_tilt_angle(0)
 
 def shake_head():
     """Shake head - no, resigned amusement"""
     for _ in range(3):
         px.set_cam_pan_angle(-25)
-        time.sleep(0.15)
+        if _pause(0.15):
+            break
         px.set_cam_pan_angle(25)
-        time.sleep(0.15)
+        if _pause(0.15):
+            break
     px.set_cam_pan_angle(0)
 
 def tilt_head():
@@ -167,20 +196,22 @@ HEAD_ACTIONS = {
 # All actions combined
 ALL_ACTIONS = {**BODY_ACTIONS, **HEAD_ACTIONS}
 
-def execute_action(action_name: str, table_mode: bool = False) -> bool:
-    """
-    Execute an action by name.
-    Returns True if executed, False if blocked or unknown.
-    """
-    action_name = action_name.lower().strip()
+@functools.lru_cache(maxsize=128)
+def _resolve(action_name: str) -> tuple[Callable | None, bool]:
+    """Normalize a name once. Returns (action function or None, is body action)."""
+    name = action_name.lower().strip()
+    return ALL_ACTIONS.get(name), name in BODY_ACTIONS
+
+def _run_action(action_name: str, table_mode: bool) -> bool:
+    """Look up and run one action without touching the cancel flag."""
+    action_func, is_body = _resolve(action_name)
 
     # Check if body action and in table mode
-    if table_mode and action_name in BODY_ACTIONS:
+    if table_mode and is_body:
         print(f"Action '{action_name}' blocked - table mode active")
         return False
 
     # Get and execute action
-    action_func = ALL_ACTIONS.get(action_name)
     if action_func:
         try:
             action_func()
@@ -192,7 +223,34 @@ def execute_action(action_name: str, table_mode: bool = False) -> bool:
         print(f"Unknown action: {action_name}")
         return False
 
+def _take_cancel() -> bool:
+    """
+    True if cancel_actions() was called. The cancel is used up here, not when
+    a routine starts, so one that lands just before a routine still stops it.
+    """
+    if _cancel.is_set():
+        _cancel.clear()
+        return True
+    return False
+
+def execute_action(action_name: str, table_mode: bool = False) -> bool:
+    """
+    Execute an action by name.
+    Returns True if executed, False if blocked, unknown or cancelled.
+    """
+    if _take_cancel():
+        print("Action cancelled")
+        return False
+    result = _run_action(action_name, table_mode)
+    _take_cancel()  # A cancel that cut this action short is used up
+    return result
+
 def execute_actions(action_list: list[str], table_mode: bool = False):
-    """Execute a list of actions in order."""
+    """Execute a list of actions in order. Stops early on cancel_actions()."""
     for action in action_list:
-        execute_action(action, table_mode)
+        if _take_cancel():
+            print("Action sequence cancelled")
+            break
+        _run_action(action, table_mode)
+    else:
+        _take_cancel()  # A cancel that cut the last action short is used up
@@ -5,13 +5,17 @@ import os
 os.getlogin = lambda: "pi"  # Patch for systemd
 
 from sunfounder_controller import SunFounderController
-from picarx import Picarx
 from robot_hat import utils
 from vilib import Vilib
 from time import sleep
+import selectors
 import socket
-import threading
-import json
+
+# orjson parses bytes directly and is several times faster; json also accepts bytes
+try:
+    import orjson as fast_json
+except ImportError:
+    import json as fast_json
 
 utils.reset_mcu()
 sleep(0.2)
@@ -22,7 +26,7 @@ sc.set_type("Picarx")
 sc.set("video", "http://192.168.1.101:9000/mjpg")  # Tell app where video is
 sc.start()
 
-px = Picarx()
+from actions import px  # Shared Picarx instance (after reset_mcu above)
 speed = 0
 
 AVOID_OBSTACLES_SPEED = 40
@@ -51,50 +55,65 @@ def send_to_voice(text):
         print(f"[APP] Voice send failed: {e}")
         return False
 
+# Command socket is polled by the main loop tick (epoll on Linux)
+_selector = selectors.DefaultSelector()
+
 def start_command_socket(px):
-    """Socket server for voice commands"""
-    def handle_client(conn, px):
-        while True:
+    """Listen for voice commands - serviced from the main loop, no threads"""
+    def stop_and_center(params):
+        px.forward(0)
+        px.set_dir_servo_angle(0)
+
+    # action -> handler(params), built once
+    handlers = {
+        'forward': lambda p: px.forward(p.get('speed', 30)),
+        'backward': lambda p: px.backward(p.get('speed', 30)),
+        'turn_left': lambda p: px.set_dir_servo_angle(-30),
+        'turn_right': lambda p: px.set_dir_servo_angle(30),
+        'stop': stop_and_center,
+        'camera_pan': lambda p: px.set_cam_pan_angle(p.get('angle', 0)),
+        'camera_tilt': lambda p: px.set_cam_tilt_angle(p.get('angle', 0)),
+    }
+
+    def accept(sock):
+        conn, _ = sock.accept()
+        conn.setblocking(False)
+        _selector.register(conn, selectors.EVENT_READ, handle_client)
+
+    def handle_client(conn):
+        try:
             data = conn.recv(1024)
-            if not data:
-                break
+        except ConnectionError:
+            data = b''
+        if not data:
+            _selector.unregister(conn)
+            conn.close()
+            return
+        try:
+            cmd = fast_json.loads(data)
+            handler = handlers.get(cmd.get('action'))
+            if handler:
+                handler(cmd.get('params', {}))
+
+            conn.send(b'OK')
+        except Exception as e:
             try:
-                cmd = json.loads(data.decode('utf-8'))
-                action = cmd.get('action')
-                params = cmd.get('params', {})
-
-                if action == 'forward':
-                    px.forward(params.get('speed', 30))
-                elif action == 'backward':
-                    px.backward(params.get('speed', 30))
-                elif action == 'turn_left':
-                    px.set_dir_servo_angle(-30)
-                elif action == 'turn_right':
-                    px.set_dir_servo_angle(30)
-                elif action == 'stop':
-                    px.forward(0)
-                    px.set_dir_servo_angle(0)
-                elif action == 'camera_pan':
-                    px.set_cam_pan_angle(params.get('angle', 0))
-                elif action == 'camera_tilt':
-                    px.set_cam_tilt_angle(params.get('angle', 0))
-
-                conn.send(b'OK')
-            except Exception as e:
                 conn.send(f'ERROR:{e}'.encode())
-        conn.close()
+            except OSError:
+                pass
 
-    def server_thread():
-        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        sock.bind(('127.0.0.1', 5555))
-        sock.listen(5)
-        print("✓ Command socket ready (port 5555)")
-        while True:
-            conn, _ = sock.accept()
-            threading.Thread(target=handle_client, args=(conn, px), daemon=True).start()
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind(('127.0.0.1', 5555))
+    sock.listen(5)
+    sock.setblocking(False)
+    _selector.register(sock, selectors.EVENT_READ, accept)
+    print("✓ Command socket ready (port 5555)")
 
-    threading.Thread(target=server_thread, daemon=True).start()
+def service_command_socket(timeout):
+    """Wait up to timeout for socket activity and handle it (replaces the loop sleep)."""
+    for key, _ in _selector.select(timeout):
+        key.data(key.fileobj)
 
 def horn():
     # Horn disabled - voice service owns the speaker
@@ -127,6 +146,24 @@ def get_status(val_list):
 
 last_line_state = "stop"
 
+# Controller keys read by the main loop
+CONTROLLER_KEYS = ("A", "B", "speak", "I", "E", "K", "Q", "N", "O")
+
+def snapshot():
+    """Read every controller key once per tick."""
+    return {key: sc.get(key) for key in CONTROLLER_KEYS}
+
+# Last value seen per controller key - lets the loop act only on changes
+_last_values = {}
+_UNSET = object()
+
+def changed(state, key):
+    """Look up a key in a snapshot. Returns (value, True if it differs from last tick)."""
+    value = state[key]
+    old = _last_values.get(key, _UNSET)
+    _last_values[key] = value
+    return value, value != old
+
 def line_track():
     global last_line_state
     gm_val_list = px.get_grayscale_data()
@@ -157,23 +194,26 @@ def main():
     print("Video: http://192.168.1.101:9000/mjpg")
     
     while True:
-        sleep(0.05)
+        service_command_socket(0.05)
+        state = snapshot()
         
-        # Buttons
-        if sc.get("A") == True:
+        # Buttons (act on press, not while held)
+        button_a, a_changed = changed(state, "A")
+        if a_changed and button_a == True:
             horn()
-        if sc.get("B") == True:
+        button_b, b_changed = changed(state, "B")
+        if b_changed and button_b == True:
             px.set_cam_pan_angle(0)
             px.set_cam_tilt_angle(0)
         
         # Speech commands - route to voice assistant (Jarvis)
-        speak = sc.get("speak")
+        speak = state["speak"]
         if speak:
             send_to_voice(speak)  # Route to Jarvis instead of keyword matching
         
         # Line track / Avoid obstacles switches
-        line_track_switch = sc.get("I")
-        avoid_obstacles_switch = sc.get("E")
+        line_track_switch = state["I"]
+        avoid_obstacles_switch = state["E"]
         
         if line_track_switch:
             speed = LINE_TRACK_SPEED
@@ -182,7 +222,7 @@ def main():
             avoid_obstacles()
         else:
             # Joystick control
-            Joystick_K = sc.get("K")
+            Joystick_K = state["K"]
             if Joystick_K:
                 dir_angle = utils.mapping(Joystick_K[0], -100, 100, -30, 30)
                 speed = Joystick_K[1]
@@ -195,24 +235,22 @@ def main():
                     px.stop()
         
         # Camera servo control
-        Joystick_Q = sc.get("Q")
-        if Joystick_Q:
+        Joystick_Q, q_changed = changed(state, "Q")
+        if Joystick_Q and q_changed:
             pan = min(90, max(-90, Joystick_Q[0]))
             tilt = min(65, max(-35, Joystick_Q[1]))
             px.set_cam_pan_angle(pan)
             px.set_cam_tilt_angle(tilt)
         
-        # Color detection (safe)
-        if sc.get("N"):
-            Vilib.color_detect("red")
-        else:
-            Vilib.color_detect("close")
+        # Color detection (safe) - only switch Vilib on transitions
+        color_switch, n_changed = changed(state, "N")
+        if n_changed:
+            Vilib.color_detect("red" if color_switch else "close")
         
         # Face detection (safe)
-        if sc.get("O"):
-            Vilib.face_detect_switch(True)
-        else:
-            Vilib.face_detect_switch(False)
+        face_switch, o_changed = changed(state, "O")
+        if o_changed:
+            Vilib.face_detect_switch(bool(face_switch))
         
         # Object detection - DISABLED (needs tflite)
         # Skip P button - not available on Python 3.13
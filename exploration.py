@@ -3,16 +3,49 @@ Jarvis Exploration Module
 Cute curious exploration - HEAD LEADS, BODY FOLLOWS. Like a curious creature.
 """
 
+import atexit
+import collections
+import logging
+import statistics
+import threading
 import time
 import random
-import cv2
-import numpy as np
-import base64
-from openai import OpenAI
-from actions import px  # Use shared Picarx instance from actions module
+import re
+from concurrent.futures import Future, ThreadPoolExecutor
+from actions import px, steer  # Use shared Picarx instance from actions module
 from keys import OPENAI_API_KEY
 
-client = OpenAI(api_key=OPENAI_API_KEY)
+# cv2, numpy, openai/httpx and picamera2 are imported where first used -
+# together they cost about a second on a Pi, and importing this module
+# shouldn't pay that before anyone explores
+
+# SIMD base64 - same API as the stdlib module
+try:
+    import pybase64 as base64
+except ImportError:
+    import base64
+
+_client = None
+
+def _get_client():
+    """OpenAI client, created on the first vision call."""
+    global _client
+    if _client is None:
+        import httpx
+        from openai import OpenAI
+        # HTTP/2 lets the OBSERVE call and a background describe share one connection.
+        # httpx drops idle connections after 5s by default - shorter than the gap
+        # between observations - so each call would pay a fresh TLS handshake.
+        _client = OpenAI(
+            api_key=OPENAI_API_KEY,
+            timeout=VISION_TIMEOUT,
+            http_client=httpx.Client(http2=True, limits=httpx.Limits(
+                max_connections=4,
+                max_keepalive_connections=4,
+                keepalive_expiry=VISION_KEEPALIVE,
+            )),
+        )
+    return _client
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CONSTANTS
@@ -35,70 +68,221 @@ SPEAK_INTERVAL_MAX = 60        # seconds
 SAFE_DISTANCE = 40             # cm
 DANGER_DISTANCE = 25           # cm
 CORNER_THRESHOLD = 3           # consecutive obstacles before "stuck"
+OPEN_DISTANCE = 80             # cm - beyond this, an open view may skip vision
+OPEN_SKIP_CHANCE = 0.5         # chance to skip an OBSERVE when it's wide open
+MOTOR_TICK = 0.02              # seconds - poll interval while a move or pause is running
+DISTANCE_CACHE_TIME = 0.1      # seconds - reuse the last reading within this window
+DISTANCE_FILTER_WINDOW = 0.5   # seconds - median only over readings this fresh
+
+# Camera
+FRAME_WIDTH = 320
+FRAME_HEIGHT = 240
+# Image budget per vision call: "detail: low" bills a flat 85 tokens at any
+# size, so send the smallest JPEG that still reads (a few KB, well under 8KB)
+VISION_SIZE = (128, 96)        # sent to the vision API ("detail: low" downsamples anyway)
+VISION_JPEG_QUALITY = 40
+ANALYSIS_REUSE_TIME = 15       # seconds - SPEAK describes from a recent OBSERVE result
+VISION_TIMEOUT = 15.0          # seconds - give up on a stuck vision call
+VISION_KEEPALIVE = 120.0       # seconds - keep the API connection open between calls
 
 MAX_EXPLORE_DURATION = 3600    # 1 hour max
-DEBUG = True
+DEBUG = False                  # Per-tick sensor/loop chatter (logged at DEBUG level)
+
+# Hot-loop messages go through logging with %-style args, so nothing is
+# formatted or written when DEBUG is off
+log = logging.getLogger("explore")
+log.setLevel(logging.DEBUG if DEBUG else logging.INFO)
+if not log.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(_log_handler)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # SENSORS
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# (timestamp, cm) of the last few readings, for the median filter
+_distance_samples = collections.deque(maxlen=3)
+
 def get_distance() -> float:
-    """Get ultrasonic distance in cm."""
+    """
+    Get ultrasonic distance in cm.
+    A read takes 30-60ms, so calls within DISTANCE_CACHE_TIME reuse the last
+    result. Returns the median of recent readings to drop single glitches.
+    """
+    now = time.monotonic()
+    if _distance_samples and now - _distance_samples[-1][0] < DISTANCE_CACHE_TIME:
+        return _median_distance(now)
+
     try:
         raw = px.ultrasonic.read()
         if raw < 2:
-            if DEBUG:
-                print(f"[SENSOR] Bad reading {raw}cm, assuming safe")
-            return 100
-        return raw
+            log.debug("[SENSOR] Bad reading %scm, assuming safe", raw)
+            raw = 100
     except Exception as e:
-        if DEBUG:
-            print(f"[SENSOR] Error: {e}")
-        return 100
+        log.debug("[SENSOR] Error: %s", e)
+        raw = 100
+
+    _distance_samples.append((now, raw))
+    return _median_distance(now)
+
+def _median_distance(now: float) -> float:
+    """Median of readings newer than DISTANCE_FILTER_WINDOW (stale ones could hide an obstacle)."""
+    recent = [cm for t, cm in _distance_samples if now - t <= DISTANCE_FILTER_WINDOW]
+    return statistics.median(recent)
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # CAMERA
 # ═══════════════════════════════════════════════════════════════════════════════
 
+# Opened once per exploration - reopening V4L2 per frame costs hundreds of ms.
+# A reader thread keeps pulling frames so the driver queue never goes stale;
+# capture_frame() just hands back the newest one.
+_cap = None
+_cap_lock = threading.Lock()
+_latest_frame = None
+_frame_lock = threading.Lock()
+_frame_ready = threading.Event()
+_reader_stop = threading.Event()
+_reader_thread = None
+
+class _PiCamera:
+    """picamera2 behind the cv2.VideoCapture read()/release() interface."""
+
+    def __init__(self):
+        from picamera2 import Picamera2
+        self.cam = Picamera2()
+        try:
+            # libcamera's "RGB888" is B,G,R byte order - what OpenCV expects
+            self.cam.configure(self.cam.create_video_configuration(
+                main={"size": (FRAME_WIDTH, FRAME_HEIGHT), "format": "RGB888"}
+            ))
+            self.cam.start()
+        except Exception:
+            self.cam.close()  # Don't keep a half-open camera
+            raise
+
+    def read(self):
+        return True, self.cam.capture_array()
+
+    def release(self):
+        self.cam.stop()
+        self.cam.close()
+
+def _open_camera():
+    """Open the camera at our target size (libcamera if available, else V4L2)."""
+    try:
+        return _PiCamera()
+    except Exception as e:
+        # No picamera2, or no CSI camera (picamera2 ships with Pi OS, so a
+        # USB-camera setup gets RuntimeError/IndexError here)
+        log.debug("[CAMERA] picamera2 unavailable (%s), using V4L2", e)
+    import cv2
+    cap = cv2.VideoCapture(0)
+    # USB cameras default to raw YUYV; MJPG moves less data per frame. Set
+    # before the size - some drivers only list small sizes per format.
+    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*'MJPG'))
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, FRAME_WIDTH)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, FRAME_HEIGHT)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return cap
+
+def _reader_loop():
+    """Background thread: read frames continuously into the latest-frame slot."""
+    global _cap, _latest_frame
+    while not _reader_stop.is_set():
+        ret = False
+        with _cap_lock:
+            try:
+                if _cap is None:
+                    _cap = _open_camera()
+                ret, frame = _cap.read()
+            except Exception as e:
+                log.debug("[CAMERA] Error: %s", e)
+            if not ret and _cap is not None:
+                # Device went away - reopen after a short wait
+                try:
+                    _cap.release()
+                except Exception:
+                    pass
+                _cap = None
+        if not ret:
+            _reader_stop.wait(1.0)
+            continue
+        # Swap the reference - consumers keep their frame, nothing is copied
+        with _frame_lock:
+            _latest_frame = frame
+        _frame_ready.set()
+
+def release_camera():
+    """Stop the reader thread and release the camera (also runs at exit)."""
+    global _cap, _latest_frame, _reader_thread
+    _reader_stop.set()
+    if _reader_thread is not None:
+        _reader_thread.join(timeout=1.0)
+        if not _reader_thread.is_alive():
+            _reader_thread = None  # Still stuck in a read: capture_frame() waits it out
+    with _cap_lock:
+        if _cap is not None:
+            _cap.release()
+            _cap = None
+    with _frame_lock:
+        _latest_frame = None
+    _frame_ready.clear()
+
+atexit.register(release_camera)
+
 def capture_frame():
     """Capture a frame from the camera."""
+    global _reader_thread
     try:
-        cap = cv2.VideoCapture(0)
-        cap.set(cv2.CAP_PROP_BUFFERSIZE, 1)
-        ret, frame = cap.read()
-        cap.release()
-        if ret:
-            return cv2.resize(frame, (320, 240))
-        return None
+        if _reader_thread is not None and _reader_stop.is_set():
+            if _reader_thread.is_alive():
+                return None  # Old reader still finishing - never run two at once
+            _reader_thread = None
+        if _reader_thread is None:
+            _reader_stop.clear()
+            _reader_thread = threading.Thread(target=_reader_loop, daemon=True)
+            _reader_thread.start()
+        # Only blocks until the very first frame after the camera opens
+        if not _frame_ready.wait(timeout=2.0):
+            return None
+        with _frame_lock:
+            frame = _latest_frame
+        if frame is None:
+            return None
+        if frame.shape[1] != FRAME_WIDTH or frame.shape[0] != FRAME_HEIGHT:
+            # Driver ignored the size request
+            import cv2
+            frame = cv2.resize(frame, (FRAME_WIDTH, FRAME_HEIGHT))
+        return frame
     except Exception as e:
-        if DEBUG:
-            print(f"[CAMERA] Error: {e}")
-        return None
-
-def analyze_scene(frame) -> dict:
-    """
-    Ask vision API to analyze the scene and suggest action.
-    Returns dict with: what_i_see, direction, interesting
-    """
-    if frame is None:
+        log.debug("[CAMERA] Error: %s", e)
         return None
 
-    try:
-        _, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, 70])
-        base64_image = base64.b64encode(buffer).decode('utf-8')
+# Reused resize target - vision calls run one at a time on _vision_executor -
+# and fixed encoder params; both set up on first use (cv2 is imported lazily)
+_vision_buf = None
+_jpeg_params = None
+
+def _encode_frame(frame) -> str:
+    """Shrink and JPEG-encode a frame for the vision API. Returns base64 text."""
+    global _vision_buf, _jpeg_params
+    import cv2
+    if _vision_buf is None:
+        import numpy as np
+        _vision_buf = np.empty((VISION_SIZE[1], VISION_SIZE[0], 3), dtype=np.uint8)
+        _jpeg_params = (
+            cv2.IMWRITE_JPEG_QUALITY, VISION_JPEG_QUALITY,
+            cv2.IMWRITE_JPEG_OPTIMIZE, 1,  # optimized Huffman tables - smaller, same pixels
+        )
+    small = cv2.resize(frame, VISION_SIZE, dst=_vision_buf)
+    _, buffer = cv2.imencode('.jpg', small, _jpeg_params)
+    return base64.b64encode(buffer).decode('ascii')
 
-        response = client.chat.completions.create(
-            model="gpt-4o-mini",
-            messages=[
-                {
-                    "role": "user",
-                    "content": [
-                        {
-                            "type": "text",
-                            "text": """Du är Jarvis, en liten nyfiken robot som utforskar. Beskriv kort vad du ser.
-
-Svara EXAKT i detta format:
+# Static part of the vision request - built once. The image part is per-call
+# (not a mutated shared template: OBSERVE and the describe worker can overlap).
+_VISION_FORMAT = """Svara EXAKT i detta format:
 SER: [vad du ser, max 8 ord]
 RIKTNING: [forward/left/right/back]
 INTRESSANT: [ja/nej]
@@ -107,53 +291,101 @@ Exempel:
 SER: Golv, en blå sko, kabel
 RIKTNING: forward
 INTRESSANT: ja"""
-                        },
-                        {
-                            "type": "image_url",
-                            "image_url": {
-                                "url": f"data:image/jpeg;base64,{base64_image}",
-                                "detail": "low"
-                            }
-                        }
-                    ]
+
+_VISION_PROMPT_PART = {
+    "type": "text",
+    "text": "Du är Jarvis, en liten nyfiken robot som utforskar. Beskriv kort vad du ser.\n\n"
+            + _VISION_FORMAT
+}
+
+# Same reply format for the three look_around() frames sent in one request
+_PANORAMA_PROMPT_PART = {
+    "type": "text",
+    "text": "Du är Jarvis, en liten nyfiken robot som utforskar. Bilderna är tagna åt "
+            "vänster, rakt fram och åt höger, i den ordningen. Beskriv kort vad du ser "
+            "och välj bästa riktningen.\n\n"
+            + _VISION_FORMAT
+}
+
+# Last analyze_scene() result - describe_scene() reuses it instead of a second call
+_last_analysis = {"result": None, "ts": 0.0}
+
+_RESPONSE_FIELD = re.compile(r'^\s*(SER|RIKTNING|INTRESSANT):\s*(.*?)\s*$', re.MULTILINE)
+_DIRECTIONS = frozenset(('forward', 'left', 'right', 'back'))
+
+def analyze_scene(frame) -> dict:
+    """
+    Ask vision API to analyze the scene and suggest action.
+    Takes one frame, or a [left, center, right] list from look_around(capture=True).
+    Returns dict with: what_i_see, direction, interesting
+    """
+    frames = [f for f in (frame if isinstance(frame, list) else [frame]) if f is not None]
+    if not frames:
+        return None
+    if len(frames) != 3:
+        frames = frames[:1]  # Partial panorama - the left/center/right prompt won't fit
+
+    try:
+        prompt = _PANORAMA_PROMPT_PART if len(frames) == 3 else _VISION_PROMPT_PART
+        content = [prompt]
+        for f in frames:
+            content.append({
+                "type": "image_url",
+                "image_url": {
+                    "url": f"data:image/jpeg;base64,{_encode_frame(f)}",
+                    "detail": "low"
                 }
-            ],
+            })
+
+        response = _get_client().chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": content}],
             max_tokens=60
         )
 
         text = response.choices[0].message.content
         result = {"what_i_see": None, "direction": "forward", "interesting": False}
 
-        # Parse response
-        for line in text.split('\n'):
-            line = line.strip()
-            if line.startswith('SER:'):
-                result["what_i_see"] = line.replace('SER:', '').strip()
-            elif line.startswith('RIKTNING:'):
-                direction = line.replace('RIKTNING:', '').strip().lower()
-                if direction in ['forward', 'left', 'right', 'back']:
+        # Parse response - one pass, fields in any order, missing ones keep defaults
+        for key, value in _RESPONSE_FIELD.findall(text):
+            if key == 'SER':
+                result["what_i_see"] = value
+            elif key == 'RIKTNING':
+                direction = value.lower()
+                if direction in _DIRECTIONS:
                     result["direction"] = direction
-            elif line.startswith('INTRESSANT:'):
-                interesting = line.replace('INTRESSANT:', '').strip().lower()
-                result["interesting"] = interesting == 'ja'
+            else:
+                result["interesting"] = value.lower() == 'ja'
 
-        if DEBUG:
-            print(f"[VISION] {result}")
+        log.debug("[VISION] %s", result)
+        _last_analysis.update(result=result, ts=time.monotonic())
         return result
 
     except Exception as e:
-        if DEBUG:
-            print(f"[VISION] Error: {e}")
+        log.debug("[VISION] Error: %s", e)
         return None
 
 
 def describe_scene(frame) -> str:
-    """Simple scene description for speaking."""
-    result = analyze_scene(frame)
+    """Simple scene description for speaking. Reuses a recent analysis if fresh."""
+    result = _last_analysis["result"]
+    if result is None or time.monotonic() - _last_analysis["ts"] > ANALYSIS_REUSE_TIME:
+        result = analyze_scene(frame)
     if result:
         return result.get("what_i_see")
     return None
 
+# One worker - vision calls take 0.5-2s and the robot shouldn't drive blind meanwhile
+_vision_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="vision")
+
+def submit_analyze(frame) -> Future:
+    """Run analyze_scene() in the background. Result is the analysis dict (or None)."""
+    return _vision_executor.submit(analyze_scene, frame)
+
+def submit_describe(frame) -> Future:
+    """Run describe_scene() in the background. Result is the description (or None)."""
+    return _vision_executor.submit(describe_scene, frame)
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # MOVEMENT - HEAD LEADS, BODY FOLLOWS
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -163,6 +395,22 @@ def stop():
     px.stop()
     time.sleep(0.1)  # Let motors fully stop
 
+def _hold(seconds: float, watch_front: bool = False) -> bool:
+    """
+    Keep the current motor command for `seconds`. With watch_front, polls the
+    ultrasonic every tick and stops early on an obstacle. Returns True if stopped early.
+    """
+    deadline = time.monotonic() + seconds
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        if watch_front and get_distance() < DANGER_DISTANCE:
+            px.stop()
+            log.debug("[EXPLORE] Obstacle mid-move - stopped early")
+            return True
+        time.sleep(min(MOTOR_TICK, remaining))
+
 def turn_head_to_direction(direction: str):
     """Turn head toward a direction (anticipation). Returns pan angle used."""
     angle_map = {
@@ -175,15 +423,13 @@ def turn_head_to_direction(direction: str):
     px.set_cam_pan_angle(angle)
     return angle
 
-def move_forward_short():
-    """Short creep forward (variable duration)."""
-    px.stop()
-    time.sleep(0.1)
-    px.set_dir_servo_angle(0)
-    px.forward(MOVE_SPEED)
-    time.sleep(random.uniform(MOVE_DURATION_MIN, MOVE_DURATION_MAX))
-    px.stop()
-    time.sleep(0.1)
+# direction: (steer min, steer max, reverse, duration min, duration max)
+_MOVE_TABLE = {
+    'left': (-35, -25, False, MOVE_DURATION_MIN, MOVE_DURATION_MAX),
+    'right': (25, 35, False, MOVE_DURATION_MIN, MOVE_DURATION_MAX),
+    'forward': (0, 0, False, MOVE_DURATION_MIN, MOVE_DURATION_MAX),
+    'back': (0, 0, True, 0.4, 0.6),
+}
 
 def turn_and_move(direction: str):
     """
@@ -198,33 +444,15 @@ def turn_and_move(direction: str):
     px.stop()
     time.sleep(0.1)
 
-    if direction == 'left':
-        angle = random.randint(-35, -25)
-        px.set_dir_servo_angle(angle)
-        px.forward(MOVE_SPEED)
-        time.sleep(random.uniform(MOVE_DURATION_MIN, MOVE_DURATION_MAX))
-        px.stop()
-        time.sleep(0.1)
-        px.set_dir_servo_angle(0)
-
-    elif direction == 'right':
-        angle = random.randint(25, 35)
-        px.set_dir_servo_angle(angle)
-        px.forward(MOVE_SPEED)
-        time.sleep(random.uniform(MOVE_DURATION_MIN, MOVE_DURATION_MAX))
-        px.stop()
-        time.sleep(0.1)
-        px.set_dir_servo_angle(0)
-
-    elif direction == 'forward':
-        move_forward_short()
-
-    elif direction == 'back':
-        px.set_dir_servo_angle(0)
-        px.backward(MOVE_SPEED)
-        time.sleep(random.uniform(0.4, 0.6))
+    move = _MOVE_TABLE.get(direction)
+    if move:
+        angle_min, angle_max, reverse, duration_min, duration_max = move
+        steer(random.randint(angle_min, angle_max))
+        (px.backward if reverse else px.forward)(MOVE_SPEED)
+        _hold(random.uniform(duration_min, duration_max), watch_front=not reverse)
         px.stop()
         time.sleep(0.1)
+        steer(0)
 
     # DON'T reset head to center - keep looking where we went
     # Head stays in direction = curious creature effect
@@ -236,7 +464,8 @@ def escape_corner(vision_clear_direction=None):
     If vision suggests a clear direction, use it.
     """
     print("[EXPLORE] Stuck! Escaping corner...")
-    px.stop()
+    backward, halt = px.backward, px.stop  # Called over and over below
+    halt()
     time.sleep(0.1)
 
     # Determine which way looks clear
@@ -247,50 +476,61 @@ def escape_corner(vision_clear_direction=None):
     time.sleep(0.5)
 
     # Back up in stages (deliberate, thinking through it)
-    px.set_dir_servo_angle(0)
-    px.backward(MOVE_SPEED)
+    steer(0)
+    backward(MOVE_SPEED)
     time.sleep(0.4)
-    px.stop()
+    halt()
     time.sleep(0.3)
 
-    px.backward(MOVE_SPEED)
+    backward(MOVE_SPEED)
     time.sleep(0.4)
-    px.stop()
+    halt()
     time.sleep(0.3)
 
     # Turn and back up
     angle = random.randint(40, 60) * (1 if clear_dir == 'right' else -1)
-    px.set_dir_servo_angle(angle)
-    px.backward(MOVE_SPEED)
+    steer(angle)
+    backward(MOVE_SPEED)
     time.sleep(0.4)
-    px.stop()
+    halt()
     time.sleep(0.1)
 
     # Reset
-    px.set_dir_servo_angle(0)
+    steer(0)
     px.set_cam_pan_angle(0)
     time.sleep(0.2)
 
-def look_around():
-    """Pan camera around curiously - left, center, right."""
+def look_around(capture: bool = False):
+    """
+    Pan camera around curiously - left, center, right.
+    With capture=True, returns a frame from each ([left, center, right], may hold None).
+    """
+    frames = []
     px.stop()
     time.sleep(0.1)
 
     # Look left
     px.set_cam_pan_angle(-50)
     time.sleep(0.6)
+    if capture:
+        frames.append(capture_frame())
 
     # Look center
     px.set_cam_pan_angle(0)
     time.sleep(0.4)
+    if capture:
+        frames.append(capture_frame())
 
     # Look right
     px.set_cam_pan_angle(50)
     time.sleep(0.6)
+    if capture:
+        frames.append(capture_frame())
 
     # Back to center
     px.set_cam_pan_angle(0)
     time.sleep(0.3)
+    return frames
 
 def look_at_something():
     """Tilt head curiously at something."""
@@ -324,19 +564,32 @@ def explore(
     6. QUICK CHECK - ultrasonic, wake word, timeout
     7. REPEAT
     """
-    start_time = time.time()
-    last_observation_time = time.time() - 999  # Force first observation
-    last_speak_time = time.time()
+    start_time = time.monotonic()
+    last_observation_time = time.monotonic() - 999  # Force first observation
+    last_speak_time = time.monotonic()
     next_observation_interval = random.uniform(LOOK_INTERVAL_MIN, LOOK_INTERVAL_MAX)
     next_speak_interval = random.uniform(SPEAK_INTERVAL_MIN, SPEAK_INTERVAL_MAX)
     consecutive_obstacles = 0
+    pending_thought = None  # Future from submit_describe()
+    pending_vision = None   # Future from submit_analyze()
+    last_view_open = False  # Last vision result: nothing interesting, go forward
+
+    def interrupted():
+        """Return why exploration should end now ("wake_word"/"app_control"), else None."""
+        if check_wake_word_callback and check_wake_word_callback():
+            print("[EXPLORE] Wake word detected!")
+            return "wake_word"
+        if check_app_input_callback and check_app_input_callback():
+            print("[EXPLORE] App input detected!")
+            return "app_control"
+        return None
 
     print("[EXPLORE] Starting cute curious exploration...")
     print("[EXPLORE] HEAD LEADS, BODY FOLLOWS")
 
     try:
         while True:
-            now = time.time()
+            now = time.monotonic()
             elapsed = now - start_time
 
             # === TIMEOUT CHECK ===
@@ -344,57 +597,74 @@ def explore(
                 print("[EXPLORE] Timeout")
                 return "timeout"
 
-            # === WAKE WORD CHECK ===
-            if check_wake_word_callback and check_wake_word_callback():
-                print("[EXPLORE] Wake word detected!")
-                stop()
-                return "wake_word"
-
-            # === APP INPUT CHECK ===
-            if check_app_input_callback and check_app_input_callback():
-                print("[EXPLORE] App input detected!")
-                stop()
-                return "app_control"
-
-            # === FULL OBSERVATION (variable timing) ===
-            if now - last_observation_time > next_observation_interval:
-                print("[EXPLORE] === OBSERVE ===")
+            # === WAKE WORD / APP INPUT CHECK ===
+            reason = interrupted()
+            if reason:
                 stop()
-                look_around()
-
-                # Take picture and analyze with vision
-                frame = capture_frame()
-                vision_result = None
+                return reason
+
+            # === DELIVER FINISHED THOUGHT ===
+            if pending_thought is not None and pending_thought.done():
+                description = pending_thought.result()
+                pending_thought = None
+                if description:
+                    print(f"[EXPLORE] Speaking: {description}")
+                    on_thought_callback(description)
+
+            # === ACT ON FINISHED OBSERVATION ===
+            if pending_vision is not None and pending_vision.done():
+                vision_result = pending_vision.result()
+                pending_vision = None
                 chosen_direction = 'forward'  # default
-
-                if frame is not None:
-                    vision_result = analyze_scene(frame)
-                    if vision_result:
-                        print(f"[VISION] Ser: {vision_result['what_i_see']}")
-                        print(f"[VISION] Förslag: {vision_result['direction']}, Intressant: {vision_result['interesting']}")
-
-                        # Decide based on vision
-                        if consecutive_obstacles >= CORNER_THRESHOLD:
-                            # Stuck - escape with vision help
-                            print("[EXPLORE] === STUCK - ESCAPING ===")
-                            escape_corner(vision_clear_direction=vision_result['direction'])
-                            consecutive_obstacles = 0
-                            chosen_direction = None  # Already moved
-
-                        elif vision_result['interesting']:
-                            # Something interesting - go toward it
-                            print(f"[EXPLORE] === INTERESTING! Going {vision_result['direction']} ===")
-                            chosen_direction = vision_result['direction']
-
-                        else:
-                            # Follow vision suggestion
-                            chosen_direction = vision_result['direction']
-                            print(f"[EXPLORE] === Vision suggests: {chosen_direction} ===")
+                last_view_open = bool(vision_result and vision_result['direction'] == 'forward'
+                                      and not vision_result['interesting'])
+
+                if vision_result:
+                    print(f"[VISION] Ser: {vision_result['what_i_see']}")
+                    print(f"[VISION] Förslag: {vision_result['direction']}, Intressant: {vision_result['interesting']}")
+
+                    # Decide based on vision
+                    if consecutive_obstacles >= CORNER_THRESHOLD:
+                        # Stuck - escape with vision help
+                        print("[EXPLORE] === STUCK - ESCAPING ===")
+                        escape_corner(vision_clear_direction=vision_result['direction'])
+                        consecutive_obstacles = 0
+                        chosen_direction = None  # Already moved
+
+                    elif vision_result['interesting']:
+                        # Something interesting - go toward it
+                        print(f"[EXPLORE] === INTERESTING! Going {vision_result['direction']} ===")
+                        chosen_direction = vision_result['direction']
+
+                    else:
+                        # Follow vision suggestion
+                        chosen_direction = vision_result['direction']
+                        print(f"[EXPLORE] === Vision suggests: {chosen_direction} ===")
 
                 # Move if we have a direction
                 if chosen_direction:
                     turn_and_move(chosen_direction)
 
+            # === FULL OBSERVATION (variable timing) ===
+            elif pending_vision is None and now - last_observation_time > next_observation_interval:
+                # Open floor ahead and vision just said so - often skip the API call
+                if (last_view_open and get_distance() > OPEN_DISTANCE
+                        and random.random() < OPEN_SKIP_CHANCE):
+                    print("[EXPLORE] === OBSERVE skipped - wide open ===")
+                    last_view_open = False  # Look properly next time
+                    turn_and_move('forward')
+                else:
+                    print("[EXPLORE] === OBSERVE ===")
+                    stop()
+                    # Picture at each pan angle, all sent in one vision request. It runs
+                    # in the background and the decision is made on a later tick, so
+                    # ultrasonic/wake word keep running
+                    frames = look_around(capture=True)
+                    if any(f is not None for f in frames):
+                        pending_vision = submit_analyze(frames)
+                    else:
+                        turn_and_move('forward')
+
                 # Reset timers with variable intervals
                 last_observation_time = now
                 next_observation_interval = random.uniform(LOOK_INTERVAL_MIN, LOOK_INTERVAL_MAX)
@@ -421,33 +691,35 @@ def explore(
 
                 else:
                     # Safe - creep forward
-                    if DEBUG:
-                        print(f"[EXPLORE] Safe at {distance:.0f}cm - creeping forward")
+                    log.debug("[EXPLORE] Safe at %.0fcm - creeping forward", distance)
                     turn_and_move('forward')
                     consecutive_obstacles = 0
 
             # === PAUSE (variable - feels organic) ===
             pause_duration = random.uniform(PAUSE_MIN, PAUSE_MAX)
-            if DEBUG:
-                print(f"[EXPLORE] Pausing {pause_duration:.1f}s...")
-            time.sleep(pause_duration)
+            log.debug("[EXPLORE] Pausing %.1fs...", pause_duration)
+            # Keep listening while paused instead of sleeping through it
+            pause_end = time.monotonic() + pause_duration
+            while (reason := interrupted()) is None and time.monotonic() < pause_end:
+                time.sleep(MOTOR_TICK)
+            if reason:
+                stop()
+                return reason
 
             # === SPEAK OCCASIONALLY (variable timing) ===
             # Use fresh time after pause
-            speak_check_time = time.time()
-            if on_thought_callback and (speak_check_time - last_speak_time > next_speak_interval):
+            speak_check_time = time.monotonic()
+            if (on_thought_callback and pending_thought is None
+                    and speak_check_time - last_speak_time > next_speak_interval):
                 print("[EXPLORE] === TIME TO SPEAK ===")
                 stop()
                 look_at_something()
                 time.sleep(0.4)
 
-                # Take picture and describe
+                # Take picture and describe in the background - spoken when ready
                 frame = capture_frame()
                 if frame is not None:
-                    description = describe_scene(frame)
-                    if description:
-                        print(f"[EXPLORE] Speaking: {description}")
-                        on_thought_callback(description)
+                    pending_thought = submit_describe(frame)
 
                 reset_head()
                 last_speak_time = speak_check_time
@@ -455,8 +727,12 @@ def explore(
                 print(f"[EXPLORE] Next speak in {next_speak_interval:.1f}s")
 
     finally:
+        for pending in (pending_thought, pending_vision):
+            if pending is not None:
+                pending.cancel()
         stop()
         reset_head()
+        release_camera()
         print("[EXPLORE] Exploration ended")
 
 
@@ -5,16 +5,77 @@ Leon's Interactive Modes for PiCar
 Fun stuff for a 9-year-old with an AI robot car.
 Run: python3 leon_modes.py
 """
+import atexit
+import functools
+import json
 import subprocess
+import threading
 import time
 import os
+import queue
+import re
+import select
 import sys
+from functools import partial
 
-# Enable speaker on startup
-os.system('pinctrl set 20 op dh')
+sys.path.insert(0, '/home/pi/picar-brain')
 
 # ============== SPEECH ==============
 
+SPEECH_DIR = '/tmp/leon_speech'
+PIPER_REPLY_TIMEOUT = 15  # seconds - the first reply includes loading the model
+MIN_CHUNK_WORDS = 5       # shorter sentences are joined to the next one
+SOUND_DEVICE = None       # sounddevice output (name or index); None = ALSA default, the
+                          # plug + dmix from services/asound.conf - converts the rate and
+                          # shares the speaker with voice_assistant's aplay
+_SENTENCE_END_RE = re.compile(r'(?<=[.!?])\s+')
+
+# One long-running piper per voice model - loading the ONNX model takes
+# longer than synthesizing a sentence, so never start piper per utterance
+_piper_procs = {}
+_speech_lock = threading.Lock()  # speak_async() can overlap a foreground speak()
+_persistent_piper = True  # Cleared if this piper build doesn't report finished files
+
+
+def _get_piper(model):
+    """Return a running piper process for this model, starting it if needed."""
+    proc = _piper_procs.get(model)
+    if proc is None or proc.poll() is not None:
+        os.makedirs(SPEECH_DIR, exist_ok=True)
+        proc = subprocess.Popen(
+            ['piper', '--model', model, '--output_dir', SPEECH_DIR],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+            text=True, bufsize=1
+        )
+        _piper_procs[model] = proc
+    return proc
+
+
+@functools.lru_cache(maxsize=1)
+def _ensure_speaker():
+    """Enable the speaker amp - once, on first speech rather than at import."""
+    try:
+        subprocess.run(['pinctrl', 'set', '20', 'op', 'dh'])
+    except OSError:
+        pass  # No pinctrl (not a Pi)
+
+
+@functools.lru_cache(maxsize=1)
+def _piper_voice_class():
+    """
+    PiperVoice from piper-tts, or None if it isn't installed.
+
+    As a library the voice model stays loaded in this process and audio
+    streams out as it's synthesized; without it, the piper CLI is used.
+    Imported on first speech - it pulls in onnxruntime.
+    """
+    try:
+        from piper import PiperVoice
+        return PiperVoice
+    except ImportError:
+        return None
+
+
 def speak(text, lang='sv'):
     """
     Make the car talk using Piper TTS.
@@ -33,21 +94,246 @@ def speak(text, lang='sv'):
     if not os.path.exists(model):
         model = models['sv']  # Fallback to Swedish
 
-    # Generate and play
-    subprocess.run(
-        f'echo "{text}" | piper --model {model} --output_file /tmp/speech.wav 2>/dev/null',
-        shell=True
+    # Piper reads one utterance per line - fold newlines, skip empty text
+    line = ' '.join(text.split())
+    if not line:
+        return
+
+    _ensure_speaker()
+    with _speech_lock:
+        if _piper_voice_class() is not None:
+            _speak_in_process(line, model)
+            return
+        # Synthesize sentence k+1 while sentence k plays
+        playing = None  # (aplay process, wav path)
+        for chunk in _split_sentences(line):
+            wav_path = _synthesize(chunk, model) if _persistent_piper else None
+            if playing:
+                _finish_playback(*playing)
+                playing = None
+            if wav_path:
+                aplay = subprocess.Popen(['aplay', '-q', '-D', 'plughw:1,0', wav_path],
+                                         stderr=subprocess.DEVNULL)
+                playing = (aplay, wav_path)
+            else:
+                _speak_streamed(chunk, model)
+        if playing:
+            _finish_playback(*playing)
+
+
+def _split_sentences(line):
+    """Split on sentence ends, merging short pieces so the intonation holds up."""
+    chunks = []
+    for sentence in _SENTENCE_END_RE.split(line):
+        if chunks and len(chunks[-1].split()) < MIN_CHUNK_WORDS:
+            chunks[-1] += ' ' + sentence
+        else:
+            chunks.append(sentence)
+    return chunks
+
+
+def _finish_playback(aplay, wav_path):
+    """Wait for a chunk to finish playing, then delete its file."""
+    aplay.wait()
+    os.remove(wav_path)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_voice(model):
+    """Load a piper voice once per process."""
+    return _piper_voice_class().load(model)
+
+
+def _voice_pcm(voice, line):
+    """Yield raw 16-bit mono audio for one line, a sentence at a time."""
+    if hasattr(voice, 'synthesize_stream_raw'):  # piper-tts 1.2
+        yield from voice.synthesize_stream_raw(line)
+    else:  # piper-tts 1.3+
+        for chunk in voice.synthesize(line):
+            yield chunk.audio_int16_bytes
+
+
+def _open_output_stream(sample_rate):
+    """
+    A started PortAudio stream for one utterance, or None without
+    sounddevice. Audio written to it goes straight to the device - no
+    aplay to spawn. Closed after each line so the speaker is never held.
+    """
+    try:
+        import sounddevice
+    except (ImportError, OSError):  # OSError: no PortAudio library
+        return None
+    try:
+        stream = sounddevice.RawOutputStream(
+            samplerate=sample_rate, channels=1, dtype='int16', device=SOUND_DEVICE
+        )
+        stream.start()
+    except Exception as e:  # PortAudioError, or ValueError for an unknown device
+        print(f"  Kan inte oppna ljudstrom ({e}), anvander aplay")
+        return None
+    return stream
+
+
+def _speak_in_process(line, model):
+    """Synthesize with the resident voice and stream it to the speaker as it comes."""
+    voice = _load_voice(model)
+    sample_rate = voice.config.sample_rate
+
+    # Synthesis runs ahead on its own thread, so the next sentence is
+    # ready when playback finishes the current one
+    pcm_chunks = queue.Queue()
+
+    def produce():
+        try:
+            for pcm in _voice_pcm(voice, line):
+                pcm_chunks.put(pcm)
+        finally:
+            pcm_chunks.put(None)
+
+    threading.Thread(target=produce, daemon=True).start()
+
+    stream = _open_output_stream(sample_rate)
+    if stream is not None:
+        try:
+            while (pcm := pcm_chunks.get()) is not None:
+                stream.write(pcm)
+            stream.stop()  # Plays out what is still buffered
+        finally:
+            stream.close()
+        return
+
+    aplay = subprocess.Popen(
+        ['aplay', '-q', '-D', 'plughw:1,0', '-t', 'raw', '-f', 'S16_LE', '-c', '1',
+         '-r', str(sample_rate), '-'],
+        stdin=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    try:
+        while (pcm := pcm_chunks.get()) is not None:
+            aplay.stdin.write(pcm)
+    finally:
+        aplay.stdin.close()
+        aplay.wait()
+
+
+def _synthesize(line, model):
+    """Turn one line into a WAV with the persistent piper. Returns its path, or None."""
+    global _persistent_piper
+    # One line in, piper answers with the path of the finished WAV
+    piper = _get_piper(model)
+    try:
+        piper.stdin.write(line + '\n')
+        piper.stdin.flush()
+        ready, _, _ = select.select([piper.stdout], [], [], PIPER_REPLY_TIMEOUT)
+        if ready:
+            wav_path = piper.stdout.readline().strip()
+            if wav_path:
+                return wav_path
+    except OSError:
+        pass  # piper exited
+    # Some piper builds only log the path - run it once per utterance instead
+    print("  Piper svarar inte, startar om per mening")
+    piper.kill()
+    _persistent_piper = False
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _sample_rate(model):
+    """Sample rate of a piper voice, from the .onnx.json next to it."""
+    try:
+        with open(model + '.json', encoding='utf-8') as f:
+            return json.load(f)['audio']['sample_rate']
+    except (OSError, ValueError, KeyError):
+        return 22050  # Medium-quality piper voices
+
+
+def _speak_streamed(line, model):
+    """One-shot piper streaming raw audio straight into aplay - no shell, no WAV file."""
+    piper = subprocess.Popen(
+        ['piper', '--model', model, '--output-raw'],
+        stdin=subprocess.PIPE, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL
+    )
+    aplay = subprocess.Popen(
+        ['aplay', '-q', '-D', 'plughw:1,0', '-t', 'raw', '-f', 'S16_LE', '-c', '1',
+         '-r', str(_sample_rate(model)), '-'],
+        stdin=piper.stdout, stderr=subprocess.DEVNULL
     )
-    subprocess.run('aplay -D plughw:1,0 /tmp/speech.wav 2>/dev/null', shell=True)
+    piper.stdout.close()  # aplay holds the read end now
+    piper.stdin.write(line.encode('utf-8'))
+    piper.stdin.close()
+    piper.wait()
+    aplay.wait()
 
 
 # ============== MOVEMENT ==============
 
+@functools.lru_cache(maxsize=1)
 def get_car():
-    """Get the PiCar-X controller."""
-    sys.path.insert(0, '/home/pi/picar-brain')
-    from picarx import Picarx
-    return Picarx()
+    """Get the PiCar-X controller (set up once, shared with actions.py)."""
+    # Imported here so the menu comes up without waiting on I2C setup
+    from actions import px
+    atexit.register(px.stop)
+    return px
+
+
+SERVO_TICK = 0.02        # seconds between steering setpoints in a ramp (50 Hz)
+STEER_RAMP_TIME = 0.1    # seconds to sweep the steering to a new angle
+
+_motion_stop = threading.Event()
+
+
+def stop_motion():
+    """
+    Abort the running motion sequence at its next step. Stays in effect -
+    later motions are skipped too - until the next command is queued.
+    """
+    _motion_stop.set()
+
+
+def run_motion(steps):
+    """
+    Run a list of (action, seconds to hold) steps.
+
+    Steps are timed against absolute deadlines, so holds don't drift. The
+    car always stops at the end - finished, stop_motion() or Ctrl-C.
+    """
+    px = get_car()
+    deadline = time.monotonic()
+    try:
+        for action, hold in steps:
+            if _motion_stop.is_set():  # Stopped before this motion got going
+                break
+            action()
+            deadline += hold
+            if _motion_stop.wait(max(0.0, deadline - time.monotonic())):
+                break
+    finally:
+        px.stop()
+        px.set_dir_servo_angle(0)
+
+
+def steer_ramp(start, end, seconds=STEER_RAMP_TIME):
+    """
+    Steps that sweep the steering from start to end instead of jumping.
+
+    Smootherstep easing (zero speed and acceleration at both ends), one
+    setpoint per SERVO_TICK, for use inside a run_motion() step list.
+    """
+    px = get_car()
+    ticks = max(1, round(seconds / SERVO_TICK))
+    steps = []
+    for i in range(1, ticks + 1):
+        t = i / ticks
+        eased = t * t * t * (t * (t * 6 - 15) + 10)
+        steps.append((partial(px.set_dir_servo_angle, round(start + (end - start) * eased)), SERVO_TICK))
+    return steps
+
+
+def speak_async(text, lang='sv'):
+    """Speak on a background thread so motion can run meanwhile. join() to wait."""
+    thread = threading.Thread(target=speak, args=(text, lang), daemon=True)
+    thread.start()
+    return thread
 
 
 def spin(direction='right', speed=50):
@@ -61,20 +347,20 @@ def spin(direction='right', speed=50):
     """
     px = get_car()
 
-    speak("Jag snurrar!")  # "I'm spinning!"
+    speech = speak_async("Jag snurrar!")  # "I'm spinning!"
 
-    # Turn wheels fully in direction
+    # Turn wheels fully in direction, then drive forward while turned to spin
     angle = 30 if direction == 'right' else -30
-    px.set_dir_servo_angle(angle)
-    time.sleep(0.1)
-
-    # Drive forward while turned to create spin
-    px.forward(speed)
-    time.sleep(2.0)  # Adjust for full 360
-
-    px.stop()
-    px.set_dir_servo_angle(0)
+    run_motion(
+        steer_ramp(0, angle)
+        + [
+            (partial(px.forward, speed), 2.0),  # Adjust for full 360
+            (px.stop, 0),
+        ]
+        + steer_ramp(angle, 0)
+    )
 
+    speech.join()
     speak("Woohoo!")
 
 
@@ -85,24 +371,22 @@ def dance():
     """
     px = get_car()
 
-    speak("Nu dansar jag!")  # "Now I'm dancing!"
+    speech = speak_async("Nu dansar jag!")  # "Now I'm dancing!"
 
-    # Wiggle sequence
+    # Wiggle sequence: left, right - three times - then back to center
+    wiggle = []
+    angle = 0
     for _ in range(3):
-        # Wiggle left
-        px.set_dir_servo_angle(-25)
-        px.forward(30)
-        time.sleep(0.3)
-        px.stop()
-
-        # Wiggle right
-        px.set_dir_servo_angle(25)
-        px.forward(30)
-        time.sleep(0.3)
-        px.stop()
-
-    # Back to center
-    px.set_dir_servo_angle(0)
+        for target in (-25, 25):
+            wiggle += steer_ramp(angle, target) + [
+                (partial(px.forward, 30), 0.3),
+                (px.stop, 0),
+            ]
+            angle = target
+    wiggle += steer_ramp(angle, 0)
+    run_motion(wiggle)
+
+    speech.join()
     speak("Tack tack!")  # "Thank you thank you!"
 
 
@@ -112,13 +396,12 @@ def nod():
     """
     px = get_car()
 
-    for _ in range(2):
-        px.cam_tilt.angle(20)
-        time.sleep(0.3)
-        px.cam_tilt.angle(-10)
-        time.sleep(0.3)
-
-    px.cam_tilt.angle(0)
+    run_motion([
+        (partial(px.cam_tilt.angle, 20), 0.3),
+        (partial(px.cam_tilt.angle, -10), 0.3),
+    ] * 2 + [
+        (partial(px.cam_tilt.angle, 0), 0),
+    ])
 
 
 def shake():
@@ -127,13 +410,12 @@ def shake():
     """
     px = get_car()
 
-    for _ in range(2):
-        px.cam_pan.angle(30)
-        time.sleep(0.3)
-        px.cam_pan.angle(-30)
-        time.sleep(0.3)
-
-    px.cam_pan.angle(0)
+    run_motion([
+        (partial(px.cam_pan.angle, 30), 0.3),
+        (partial(px.cam_pan.angle, -30), 0.3),
+    ] * 2 + [
+        (partial(px.cam_pan.angle, 0), 0),
+    ])
 
 
 # ============== MESSENGER MODE ==============
@@ -153,14 +435,13 @@ def messenger_mode(message, target="Mamma"):
     """
     px = get_car()
 
-    # Announce the mission
-    speak(f"Leon har skickat mig med ett meddelande till {target}.")
-    time.sleep(0.5)
-
-    # Drive forward toward target
-    px.forward(30)
-    time.sleep(3)
-    px.stop()
+    # Announce the mission while driving toward the target
+    speech = speak_async(f"Leon har skickat mig med ett meddelande till {target}.")
+    run_motion([
+        (partial(px.forward, 30), 3),
+        (px.stop, 0),
+    ])
+    speech.join()
 
     # Nod to get attention
     nod()
@@ -249,20 +530,23 @@ def patrol():
     Drive around in a square pattern.
     """
     px = get_car()
-    speak("Jag patrullerar omradet!")
-
-    for i in range(4):
-        px.forward(30)
-        time.sleep(1.5)
-        px.stop()
-
-        # Turn 90 degrees
-        px.set_dir_servo_angle(30)
-        px.forward(30)
-        time.sleep(0.6)
-        px.stop()
-        px.set_dir_servo_angle(0)
-
+    speech = speak_async("Jag patrullerar omradet!")
+
+    # Each side: drive, then turn 90 degrees
+    run_motion((
+        [
+            (partial(px.forward, 30), 1.5),
+            (px.stop, 0),
+        ]
+        + steer_ramp(0, 30)
+        + [
+            (partial(px.forward, 30), 0.6),
+            (px.stop, 0),
+        ]
+        + steer_ramp(30, 0)
+    ) * 4)
+
+    speech.join()
     speak("Patrullering klar! Omradet ar sakert.")
 
 
@@ -286,12 +570,67 @@ def show_menu():
       meddelande [text] [till] - Skicka meddelande
         Exempel: meddelande "Jag vill ha glass" Pappa
 
+      stopp           - Stanna direkt
       avsluta         - Stang programmet
 
     ===========================
     """)
 
 
+def _send_message(args):
+    """Parse: meddelande "text" target"""
+    parts = args.split('"')
+    if len(parts) >= 2:
+        text = parts[1]
+        target = parts[2].strip() if len(parts) > 2 else "Mamma"
+        messenger_mode(text, target)
+    else:
+        print("  Anvand: meddelande \"text\" namn")
+
+
+# Single-word commands, Swedish and English
+COMMANDS = {
+    "hjalp": show_menu, "help": show_menu,
+    "snurra": spin, "spin": spin,
+    "dansa": dance, "dance": dance,
+    "skamt": tell_joke, "joke": tell_joke,
+    "patrullera": patrol, "patrol": patrol,
+    "nicka": nod, "nod": nod,
+    "skaka": shake, "shake": shake,
+}
+
+# Commands that take the rest of the line as an argument
+PREFIX_COMMANDS = {
+    "saga": say_as_personality, "say": say_as_personality,
+    "personlighet": set_personality, "personality": set_personality,
+    "meddelande": _send_message,
+}
+
+
+def run_command(cmd):
+    """Run one typed command (already lowercased and stripped)."""
+    # "saga hej" -> PREFIX_COMMANDS["saga"]("hej"), "dansa" -> COMMANDS["dansa"]()
+    word, _, rest = cmd.partition(" ")
+    if rest and word in PREFIX_COMMANDS:
+        PREFIX_COMMANDS[word](rest)
+    elif cmd in COMMANDS:
+        COMMANDS[cmd]()
+    else:
+        speak("Jag forstod inte. Skriv hjalp for att se kommandon.")
+
+
+def _command_worker(commands):
+    """Run queued commands one at a time, so the prompt stays free for "stopp"."""
+    while True:
+        cmd = commands.get()
+        if cmd is None:
+            return
+        try:
+            run_command(cmd)
+        except Exception as e:
+            print(f"  Fel: {e}")
+
+
 def interactive_mode():
     """
     Interactive mode for Leon to control the car from terminal.
@@ -300,6 +639,12 @@ def interactive_mode():
     speak("Hej Leon! Jag ar redo!")
     show_menu()
 
+    # Commands run on a worker thread; this loop only reads input, so
+    # "stopp" and Ctrl-C can cut into a dance that's already going
+    commands = queue.Queue()
+    worker = threading.Thread(target=_command_worker, args=(commands,), daemon=True)
+    worker.start()
+
     while True:
         try:
             cmd = input("\nLeon > ").strip().lower()
@@ -307,57 +652,26 @@ def interactive_mode():
             if not cmd:
                 continue
 
-            if cmd == "avsluta" or cmd == "quit" or cmd == "exit":
+            if cmd in ("stopp", "stop"):
+                # Drop what was typed ahead too, then stop what's running
+                while not commands.empty():
+                    commands.get_nowait()
+                stop_motion()
+
+            elif cmd in ("avsluta", "quit", "exit"):
+                commands.put(None)
+                worker.join()  # Finish what was already asked for
                 speak("Hej da Leon!")
                 break
 
-            elif cmd == "hjalp" or cmd == "help":
-                show_menu()
-
-            elif cmd.startswith("saga ") or cmd.startswith("say "):
-                text = cmd.split(" ", 1)[1]
-                say_as_personality(text)
-
-            elif cmd == "snurra" or cmd == "spin":
-                spin()
-
-            elif cmd == "dansa" or cmd == "dance":
-                dance()
-
-            elif cmd == "skamt" or cmd == "joke":
-                tell_joke()
-
-            elif cmd == "patrullera" or cmd == "patrol":
-                patrol()
-
-            elif cmd.startswith("personlighet ") or cmd.startswith("personality "):
-                name = cmd.split(" ", 1)[1]
-                set_personality(name)
-
-            elif cmd.startswith("meddelande "):
-                # Parse: meddelande "text" target
-                parts = cmd.split('"')
-                if len(parts) >= 2:
-                    text = parts[1]
-                    target = parts[2].strip() if len(parts) > 2 else "Mamma"
-                    messenger_mode(text, target)
-                else:
-                    print("  Anvand: meddelande \"text\" namn")
-
-            elif cmd == "nicka" or cmd == "nod":
-                nod()
-
-            elif cmd == "skaka" or cmd == "shake":
-                shake()
-
             else:
-                speak("Jag forstod inte. Skriv hjalp for att se kommandon.")
+                _motion_stop.clear()  # A new command lifts an earlier "stopp"
+                commands.put(cmd)
 
         except KeyboardInterrupt:
+            stop_motion()
             speak("Hej da!")
             break
-        except Exception as e:
-            print(f"  Fel: {e}")
 
 
 # ============== MAIN ==============
@@ -367,21 +681,11 @@ if __name__ == "__main__":
         # Command line mode
         cmd = sys.argv[1].lower()
 
-        if cmd == "spin" or cmd == "snurra":
-            spin()
-        elif cmd == "dance" or cmd == "dansa":
-            dance()
-        elif cmd == "joke" or cmd == "skamt":
-            tell_joke()
-        elif cmd == "patrol" or cmd == "patrullera":
-            patrol()
-        elif cmd == "say" or cmd == "saga":
+        if cmd == "say" or cmd == "saga":
             text = " ".join(sys.argv[2:]) if len(sys.argv) > 2 else "Hej!"
             speak(text)
-        elif cmd == "nod" or cmd == "nicka":
-            nod()
-        elif cmd == "shake" or cmd == "skaka":
-            shake()
+        elif cmd in COMMANDS:
+            COMMANDS[cmd]()
         else:
             print(f"Unknown command: {cmd}")
             print("Try: spin, dance, joke, patrol, say [text], nod, shake")
@@ -4,44 +4,187 @@ Entity-based persistent memory.
 """
 
 import json
+import logging
 import os
 import re
 import tempfile
+import threading
 import shutil
 from datetime import datetime
 
 MEMORY_FILE = "memory.json"
+MEMORY_LOG = "memory.log"          # Observations appended since memory.json was written
+COMPACT_AFTER = 50                 # Log records before memory.json is rewritten
+COMPACT_DELAY = 0.5                # seconds - a burst of observations gets one rewrite
 MAX_OBSERVATIONS_PER_ENTITY = 20
 MAX_OBSERVATIONS_IN_CONTEXT = 15
 
+# memory.json + memory.log, loaded once per process. Adding an observation
+# appends one line to the log instead of rewriting the whole file.
+# Log records are numbered; memory.json stores the last number it includes
+# ("seq"), so a crash between writing it and deleting the log can't replay
+# records twice.
+_memory = None
+_log_file = None
+_log_records = 0
+_log_seq = 0
+_compact_timer = None
+_prompt_cache = None       # format_memories_for_prompt() result; None = rebuild
+_lock = threading.RLock()  # Compaction runs on a timer thread
+
+# Routine bookkeeping is logged at DEBUG; JARVIS_MEM_DEBUG=1 shows it
+log = logging.getLogger("memory")
+log.setLevel(logging.DEBUG if os.environ.get("JARVIS_MEM_DEBUG") == "1" else logging.INFO)
+if not log.handlers:
+    _log_handler = logging.StreamHandler()
+    _log_handler.setFormatter(logging.Formatter('%(message)s'))
+    log.addHandler(_log_handler)
+
+# Compiled once - parse_memory_line() runs on every line of every reply
+_MEMORY_TAG_RE = re.compile(r'MEMORY\[(\w+)\]:\s*(.+)', re.IGNORECASE)
+# Environment keywords as one alternation - a single scan instead of one per keyword
+_ENV_KEYWORDS_RE = re.compile("hittade|såg|rummet|under|bakom|golvet|bordet")
+# "leon's ", "leons " or "leon " in one anchored match
+_LEON_PREFIX_RE = re.compile(r"leon(?:'s|s)? ")
+
 def load_memory() -> dict:
     """Load memory from file."""
     if not os.path.exists(MEMORY_FILE):
-        print(f"[MEMORY] No memory file found, starting fresh")
+        log.debug("[MEMORY] No memory file found, starting fresh")
         return {"entities": {}}
     try:
         with open(MEMORY_FILE, "r", encoding="utf-8") as f:
             data = json.load(f)
             entity_count = len(data.get("entities", {}))
             total_obs = sum(len(e.get("observations", [])) for e in data.get("entities", {}).values())
-            print(f"[MEMORY] Loaded {entity_count} entities with {total_obs} total observations")
+            log.debug("[MEMORY] Loaded %d entities with %d total observations", entity_count, total_obs)
             return data
     except Exception as e:
-        print(f"[MEMORY] Load error: {e}")
+        log.warning("[MEMORY] Load error: %s", e)
         return {"entities": {}}
 
-def save_memory_file(memory: dict):
-    """Atomic save - write to temp, then rename."""
+def save_memory_file(memory: dict) -> bool:
+    """Atomic save - write to temp, then rename. Returns True on success."""
     temp_fd, temp_path = tempfile.mkstemp(suffix='.json', dir=os.path.dirname(MEMORY_FILE) or '.')
     try:
         with os.fdopen(temp_fd, 'w', encoding='utf-8') as f:
-            json.dump(memory, f, ensure_ascii=False, indent=2)
+            json.dump(memory, f, ensure_ascii=False, separators=(',', ':'))
         shutil.move(temp_path, MEMORY_FILE)
-        print(f"[MEMORY] Saved to {MEMORY_FILE}")
+        log.debug("[MEMORY] Saved to %s", MEMORY_FILE)
+        return True
     except Exception as e:
-        print(f"[MEMORY] Save error: {e}")
+        log.warning("[MEMORY] Save error: %s", e)
         if os.path.exists(temp_path):
             os.remove(temp_path)
+        return False
+
+def _store(memory: dict, entity: str, content: str, timestamp: str) -> int:
+    """Add one observation to the in-memory dict. Returns how many old ones were pruned."""
+    entities = memory["entities"]
+    if entity not in entities:
+        entities[entity] = {"observations": []}
+    obs = entities[entity]["observations"]
+    obs.append({"content": content, "timestamp": timestamp})
+
+    # Prune if too many
+    pruned_count = len(obs) - MAX_OBSERVATIONS_PER_ENTITY
+    if pruned_count > 0:
+        del obs[:pruned_count]
+        return pruned_count
+    return 0
+
+def _replay_log(memory: dict) -> int:
+    """Apply memory.log records newer than the loaded snapshot. Returns records applied."""
+    global _log_seq
+    included = memory.get("seq", -1)  # -1: snapshot from before numbering, replay all
+    _log_seq = max(included, 0)
+    if not os.path.exists(MEMORY_LOG):
+        return 0
+    count = 0
+    with open(MEMORY_LOG, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+                seq = record.get("n", 0)
+                if seq and seq <= included:
+                    continue  # Already in memory.json
+                _store(memory, record["e"], record["c"], record["t"])
+                _log_seq = max(_log_seq, seq)
+                count += 1
+            except (ValueError, KeyError, AttributeError):
+                continue  # Torn last line from a crash mid-write
+    return count
+
+def _get_memory() -> dict:
+    """The process-wide memory dict, loaded from disk on first use."""
+    global _memory, _log_records
+    with _lock:
+        if _memory is None:
+            _memory = load_memory()
+            _log_records = _replay_log(_memory)
+            if _log_records:
+                log.debug("[MEMORY] Replayed %d observations from %s", _log_records, MEMORY_LOG)
+        return _memory
+
+def compact_memory():
+    """Write everything to memory.json and start an empty log."""
+    global _log_file, _log_records, _compact_timer
+    with _lock:
+        _compact_timer = None
+        if _memory is None:
+            return
+        _memory["seq"] = _log_seq  # Everything logged so far is in this snapshot
+        if not save_memory_file(_memory):
+            return  # Keep the log - it still holds observations missing from memory.json
+        if _log_file is not None:
+            _log_file.close()
+            _log_file = None
+        if os.path.exists(MEMORY_LOG):
+            os.remove(MEMORY_LOG)
+        _log_records = 0
+
+def _schedule_compact():
+    """Compact shortly, off the caller's thread. Repeat calls before it runs are no-ops."""
+    global _compact_timer
+    if _compact_timer is None:
+        _compact_timer = threading.Timer(COMPACT_DELAY, compact_memory)
+        _compact_timer.daemon = True
+        _compact_timer.start()
+
+def _open_log():
+    """Open memory.log for appending, first ending a torn last line left by a crash."""
+    torn = False
+    try:
+        with open(MEMORY_LOG, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            torn = f.read(1) != b"\n"
+    except OSError:
+        pass  # No log yet, or empty
+    log_file = open(MEMORY_LOG, "a", encoding="utf-8", buffering=1)
+    if torn:
+        # Otherwise the next record would be glued onto the fragment and
+        # skipped with it by _replay_log()
+        log_file.write("\n")
+    return log_file
+
+def _log_observation(entity: str, content: str, timestamp: str):
+    """Append one observation to memory.log. Failures are logged, not raised."""
+    global _log_file, _log_records, _log_seq
+    _log_seq += 1
+    record = {"e": entity, "c": content, "t": timestamp, "n": _log_seq}
+    try:
+        if _log_file is None:
+            _log_file = _open_log()
+        _log_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        _log_records += 1
+    except OSError as e:
+        log.warning("[MEMORY] Log write error: %s", e)
+        if _log_file is not None:
+            try:
+                _log_file.close()
+            except OSError:
+                pass
+            _log_file = None  # Reopen on the next observation
 
 def detect_entity(text: str) -> tuple[str, str]:
     """Auto-detect entity from text. Fallback for untagged MEMORY lines."""
@@ -49,9 +192,9 @@ def detect_entity(text: str) -> tuple[str, str]:
 
     # Leon references
     if lower.startswith("leon"):
-        for prefix in ["leon's ", "leons ", "leon "]:
-            if lower.startswith(prefix):
-                return "Leon", text[len(prefix):].strip()
+        match = _LEON_PREFIX_RE.match(lower)
+        if match:
+            return "Leon", text[match.end():].strip()
         return "Leon", text
 
     # Self references
@@ -59,8 +202,7 @@ def detect_entity(text: str) -> tuple[str, str]:
         return "self", text[4:].strip()
 
     # Environment keywords
-    env_keywords = ["hittade", "såg", "rummet", "under", "bakom", "golvet", "bordet"]
-    if any(kw in lower for kw in env_keywords):
+    if _ENV_KEYWORDS_RE.search(lower):
         return "environment", text
 
     return "general", text
@@ -78,7 +220,7 @@ def parse_memory_line(line: str) -> tuple[str, str] | None:
         return None
 
     # Try explicit tag: MEMORY[entity]: observation
-    match = re.match(r'MEMORY\[(\w+)\]:\s*(.+)', line, re.IGNORECASE)
+    match = _MEMORY_TAG_RE.match(line)
     if match:
         entity = match.group(1).lower()
         observation = match.group(2).strip()
@@ -105,39 +247,43 @@ def parse_memory_line(line: str) -> tuple[str, str] | None:
 
 def add_observation(entity: str, observation: str):
     """Add observation to entity."""
+    global _prompt_cache
     if not observation or not observation.strip():
-        print(f"[MEMORY] Skipping empty observation")
+        log.debug("[MEMORY] Skipping empty observation")
         return
 
-    memory = load_memory()
+    with _lock:
+        memory = _get_memory()
 
-    if entity not in memory["entities"]:
-        print(f"[MEMORY] Creating new entity: {entity}")
-        memory["entities"][entity] = {"observations": []}
+        if entity not in memory["entities"]:
+            log.debug("[MEMORY] Creating new entity: %s", entity)
 
-    timestamp = datetime.now().isoformat()
-    memory["entities"][entity]["observations"].append({
-        "content": observation.strip(),
-        "timestamp": timestamp
-    })
-
-    # Prune if too many
-    obs = memory["entities"][entity]["observations"]
-    if len(obs) > MAX_OBSERVATIONS_PER_ENTITY:
-        pruned_count = len(obs) - MAX_OBSERVATIONS_PER_ENTITY
-        memory["entities"][entity]["observations"] = obs[-MAX_OBSERVATIONS_PER_ENTITY:]
-        print(f"[MEMORY] Pruned {pruned_count} old observations from {entity}")
+        content = observation.strip()
+        timestamp = datetime.now().isoformat()
+        pruned_count = _store(memory, entity, content, timestamp)
+        if pruned_count:
+            log.debug("[MEMORY] Pruned %d old observations from %s", pruned_count, entity)
 
-    save_memory_file(memory)
-    print(f"[MEMORY] Added: [{entity}] {observation}")
+        _log_observation(entity, content, timestamp)
+        _prompt_cache = None
+        if _log_records >= COMPACT_AFTER:
+            _schedule_compact()
+    log.info("[MEMORY] Added: [%s] %s", entity, observation)
 
 def format_memories_for_prompt() -> str:
-    """Format memories for system prompt injection."""
-    memory = load_memory()
+    """Format memories for system prompt injection. Rebuilt only after a new observation."""
+    global _prompt_cache
+    with _lock:
+        if _prompt_cache is None:
+            _prompt_cache = _build_prompt(_get_memory())
+        return _prompt_cache
+
+def _build_prompt(memory: dict) -> str:
+    """Format the most recent observations per entity, in priority order."""
     entities = memory.get("entities", {})
 
     if not entities:
-        print(f"[MEMORY] No memories to format for prompt")
+        log.debug("[MEMORY] No memories to format for prompt")
         return ""
 
     sections = []
@@ -168,10 +314,10 @@ def format_memories_for_prompt() -> str:
                 break
 
         sections.append("\n".join(lines))
-        print(f"[MEMORY] Formatted {len(recent)} observations for {entity}")
+        log.debug("[MEMORY] Formatted %d observations for %s", len(recent), entity)
 
         if total >= MAX_OBSERVATIONS_IN_CONTEXT:
             break
 
-    print(f"[MEMORY] Total {total} observations included in prompt")
+    log.debug("[MEMORY] Total %d observations included in prompt", total)
     return "\n\n".join(sections)
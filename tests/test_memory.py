@@ -0,0 +1,61 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+import memory
+
+
+@pytest.fixture
+def mem(tmp_path, monkeypatch):
+    """A fresh memory module working in an empty directory."""
+    monkeypatch.chdir(tmp_path)
+    module = importlib.reload(memory)
+    yield module
+    if module._log_file is not None:
+        module._log_file.close()
+
+
+def reload(module):
+    """Simulate a restart: drop the open log and load everything from disk again."""
+    if module._log_file is not None:
+        module._log_file.close()
+    return importlib.reload(module)
+
+
+def contents(module, entity="Leon"):
+    return [o["content"] for o in module._get_memory()["entities"][entity]["observations"]]
+
+
+def test_observation_added_after_torn_tail_survives(mem):
+    mem.add_observation("Leon", "gillar dinosaurier")
+    mem = reload(mem)
+
+    # Crash mid-write: a record without its closing newline
+    with open(mem.MEMORY_LOG, "a", encoding="utf-8") as f:
+        f.write('{"e": "Leon", "c": "halv')
+
+    mem.add_observation("Leon", "gillar T-rex")
+    mem = reload(mem)
+    assert contents(mem) == ["gillar dinosaurier", "gillar T-rex"]
+
+    mem.compact_memory()
+    mem = reload(mem)
+    assert contents(mem) == ["gillar dinosaurier", "gillar T-rex"]
+
+
+def test_crash_between_snapshot_and_log_delete_does_not_duplicate(mem):
+    mem.add_observation("Leon", "a")
+    mem.add_observation("Leon", "b")
+
+    # memory.json written, memory.log not yet removed
+    mem._memory["seq"] = mem._log_seq
+    mem.save_memory_file(mem._memory)
+
+    mem = reload(mem)
+    mem.add_observation("Leon", "c")
+    mem = reload(mem)
+    assert contents(mem) == ["a", "b", "c"]
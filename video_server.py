@@ -4,29 +4,39 @@
 import os
 os.getlogin = lambda: "pi"  # Patch for systemd
 
-from robot_hat.utils import reset_mcu
-from vilib import Vilib
 from time import sleep
 import signal
 import sys
+import threading
 
-reset_mcu()
-sleep(0.2)
+def main():
+    # Hardware libraries are imported here, so importing this module is cheap
+    from robot_hat.utils import reset_mcu
+    from vilib import Vilib
 
-def signal_handler(sig, frame):
-    print("Shutting down...")
-    Vilib.camera_close()
-    sys.exit(0)
+    reset_mcu()
+    sleep(0.2)
 
-signal.signal(signal.SIGTERM, signal_handler)
-signal.signal(signal.SIGINT, signal_handler)
+    def signal_handler(sig, frame):
+        print("Shutting down...")
+        Vilib.camera_close()
+        sys.exit(0)
 
-print("Starting PiCar video server...")
-Vilib.camera_start(vflip=False, hflip=False)
-Vilib.display(local=False, web=True)
+    signal.signal(signal.SIGTERM, signal_handler)
+    signal.signal(signal.SIGINT, signal_handler)
 
-print("Video streaming at http://192.168.1.101:9000/mjpg")
+    print("Starting PiCar video server...")
+    Vilib.camera_start(vflip=False, hflip=False)
+    Vilib.display(local=False, web=True)
 
-# Keep running
-while True:
-    sleep(1)
+    print("Video streaming at http://192.168.1.101:9000/mjpg")
+
+    # Keep running - sleep until a signal arrives (the handler exits)
+    if hasattr(signal, "pause"):
+        while True:
+            signal.pause()
+    else:
+        threading.Event().wait()
+
+if __name__ == "__main__":
+    main()